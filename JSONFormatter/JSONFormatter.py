@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Sublime Text 插件：把选区里（可能被二次转义的）JSON 格式化展开。"""
+import json
+import sys
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+try:
+    import sublime
+    import sublime_plugin
+    _TextCommand = sublime_plugin.TextCommand
+except ImportError:
+    # 脱离 Sublime 环境（比如直接跑测试）时也能导入本模块
+    sublime = None
+    _TextCommand = object
+
+# 控制台调试输出开关；默认关掉，大段 JSON 时同步 stdout 很拖
+DEBUG = False
+
+# 只有以容器开头的字符串才可能展开出结构；标量 JSON 本来就原样保留
+_JSON_STARTS = ('{', '[')
+
+_JSON_LOADS = json.loads
+
+
+class JsonFormatterCommand(_TextCommand):
+    """格式化当前选区的 JSON，选区为空则处理整个缓冲区。"""
+
+    def run(self, edit):
+        if DEBUG:
+            print(f"python的环境：{sys.version}")
+        view = self.view
+        selection = view.sel()
+        if selection and not selection[0].empty():
+            region = selection[0]
+        else:
+            region = sublime.Region(0, view.size())
+        selected_text = view.substr(region)
+        if DEBUG:
+            # 只记长度：把几 MB 的选区原文拼进日志等于白拷一遍
+            print(f"selected_text 长度：{len(selected_text)}")
+        # 固定两字符字面量用不着正则引擎，str.replace 一次 C 调用搞定
+        unescaped_text = selected_text.replace('\\"', '"')
+        # orjson 的 C 解析/序列化比 stdlib 快好几倍，大段粘贴时差距明显；
+        # 没装时退回 json
+        try:
+            if _orjson is not None:
+                parsed = _orjson.loads(unescaped_text)
+            else:
+                parsed = json.loads(unescaped_text)
+        except ValueError as exc:
+            sublime.status_message("JSON 解析失败：" + str(exc))
+            return
+        processed = self._process_nested_json(parsed)
+        if _orjson is not None:
+            formatted_json = _orjson.dumps(
+                processed,
+                option=_orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS,
+            ).decode()
+        else:
+            formatted_json = json.dumps(processed, indent=4,
+                                        ensure_ascii=False)
+        view.replace(edit, region, formatted_json)
+        sublime.set_clipboard(formatted_json)
+        if DEBUG:
+            print(f"格式化完成，共{len(formatted_json)}个字符")
+
+    def _process_nested_json(self, obj):
+        """把容器里被转义成字符串的 JSON 递归展开成真正的结构。
+
+        遍历用显式栈自底向上装配，不付逐层函数调用的帧开销，
+        超深的转义大块也不会撞到递归上限。
+        """
+        holder = {'root': None}
+        stack = [(obj, holder, 'root')]
+        # 绑定成局部名，循环里 LOAD_FAST 替代每轮的全局/方法查找
+        loads = _JSON_LOADS
+        push = stack.append
+        while stack:
+            node, parent, key = stack.pop()
+            if isinstance(node, str):
+                # 先看首个非空白字符：绝大多数字符串根本不是 JSON，
+                # 廉价拒绝掉就不用进 loads 再靠异常展开收场
+                probe = node.lstrip()
+                if not probe or probe[0] not in _JSON_STARTS:
+                    parent[key] = node
+                    continue
+                try:
+                    parsed = loads(node)
+                except (ValueError, TypeError):
+                    parent[key] = node
+                    continue
+                if isinstance(parsed, (dict, list)):
+                    push((parsed, parent, key))
+                else:
+                    # 标量字符串（比如 "123"）保持原样，不做展开
+                    parent[key] = node
+            elif isinstance(node, dict):
+                # 子值全是数字/布尔/None 的容器不可能再展开出结构，
+                # 原引用直接塞回去，省掉克隆和一轮子节点入栈
+                if all(not isinstance(v, (str, dict, list))
+                       for v in node.values()):
+                    parent[key] = node
+                    continue
+                # 子节点后入栈的先弹出，赋值顺序是反的；先用 fromkeys
+                # 按源顺序占好全部键位，之后怎么填都不动键序
+                container = dict.fromkeys(node)
+                parent[key] = container
+                for k, v in node.items():
+                    push((v, container, k))
+            elif isinstance(node, list):
+                if all(not isinstance(v, (str, dict, list)) for v in node):
+                    parent[key] = node
+                    continue
+                container = [None] * len(node)
+                parent[key] = container
+                for i, v in enumerate(node):
+                    push((v, container, i))
+            else:
+                parent[key] = node
+        return holder['root']
@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""JSONFormatter：Sublime Text 的 JSON 格式化插件。"""
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""json_formatter：旧入口，实现统一收口到 JSONFormatter.py。
+
+两份同名 JsonFormatterCommand 会让 Sublime 在加载时注册两次、
+各自维护一份状态；这里只做转发，保留旧模块名兼容。
+"""
+from .JSONFormatter import JsonFormatterCommand
+
+__all__ = ['JsonFormatterCommand']
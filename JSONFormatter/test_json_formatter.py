@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""嵌套 JSON 展开行为的测试（直接 python 运行）。"""
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from JSONFormatter.JSONFormatter import JsonFormatterCommand
+
+_VERBOSE = bool(os.environ.get('TIDY_VERBOSE'))
+
+
+def _process(obj):
+    return JsonFormatterCommand()._process_nested_json(obj)
+
+
+def test_key_order_preserved():
+    """每层 dict 的键序都要和源数据一致，不能被栈的弹出顺序翻转。"""
+    data = {
+        'a': {'x': 1, 'y': 'txt', 'z': 3},
+        'b': [1, 'two', 3],
+        'c': 'plain',
+        'n': 5,
+    }
+    out = _process(json.loads(json.dumps(data)))
+    assert list(out.keys()) == list(data.keys()), list(out.keys())
+    assert list(out['a'].keys()) == ['x', 'y', 'z'], list(out['a'].keys())
+    # 序列化结果也得按源顺序输出
+    assert json.dumps(out, ensure_ascii=False) == \
+        json.dumps(data, ensure_ascii=False)
+    if _VERBOSE:
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+
+
+def test_nested_string_expanded():
+    """被转义成字符串的 JSON 要展开成结构，且展开处的键序不变。"""
+    inner = {'first': 1, 'second': {'p': 'q', 'r': 's'}, 'third': 3}
+    data = {'head': 'x', 'payload': json.dumps(inner), 'tail': 'y'}
+    out = _process(data)
+    assert list(out.keys()) == ['head', 'payload', 'tail']
+    assert out['payload'] == inner
+    assert list(out['payload'].keys()) == ['first', 'second', 'third']
+    assert list(out['payload']['second'].keys()) == ['p', 'r']
+
+
+def test_non_json_strings_kept():
+    """不是 JSON 的字符串与标量 JSON 字符串都原样保留。"""
+    data = {'msg': 'hello {world', 'num': '123', 'arr': '[1, 2]'}
+    out = _process(data)
+    assert out['msg'] == 'hello {world'
+    assert out['num'] == '123'
+    assert out['arr'] == [1, 2]
+
+
+if __name__ == '__main__':
+    test_key_order_preserved()
+    test_nested_string_expanded()
+    test_non_json_strings_kept()
+    print('嵌套 JSON 展开测试通过')
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""TidySameVideo：按文件名相似度归并重复视频的小工具。"""
+from .context import VideoOrganizerContext, clean_filename
+from .data_processor import (
+    are_files_similar,
+    create_inverted_index,
+    find_similar_file_groups,
+    iter_video_files,
+    scan_directory,
+    scan_multiple_directories,
+)
+from .parallel_executor import (
+    calculate_optimal_workers,
+    execute_move_task,
+    parallel_execute_tasks,
+)
+from .keyword_filter import (
+    add_blacklisted_keyword,
+    get_keyword_blacklist,
+    is_blacklisted_keyword,
+)
+
+__all__ = [
+    'VideoOrganizerContext', 'clean_filename',
+    'are_files_similar', 'create_inverted_index',
+    'find_similar_file_groups', 'iter_video_files',
+    'scan_directory', 'scan_multiple_directories',
+    'add_blacklisted_keyword', 'get_keyword_blacklist',
+    'is_blacklisted_keyword',
+    'calculate_optimal_workers', 'execute_move_task',
+    'parallel_execute_tasks',
+]
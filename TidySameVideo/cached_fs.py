@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""带缓存的文件系统存在性/大小查询。
+
+任务生成阶段会对大量共享父目录的路径反复 exists/getsize，
+结果在一次规划内基本不变，缓存后重复查询从一次系统调用
+变成一次字典命中。执行器真正动过的路径要调 invalidate。
+"""
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=65536)
+def exists(path):
+    return os.path.exists(path)
+
+
+@functools.lru_cache(maxsize=65536)
+def getsize(path):
+    return os.path.getsize(path)
+
+
+def invalidate(path=None):
+    """使缓存失效；path 仅作语义标记，lru_cache 只支持整体清空。"""
+    exists.cache_clear()
+    getsize.cache_clear()
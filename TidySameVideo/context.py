@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""视频整理工具的共享上下文：文件名分词与倒排索引。"""
+import functools
+import json
+import logging
+import os
+import re
+import tempfile
+from collections import defaultdict
+
+try:
+    import jieba
+    JIEBA_AVAILABLE = True
+except ImportError:
+    JIEBA_AVAILABLE = False
+
+if JIEBA_AVAILABLE:
+    # 词典加载要几百毫秒，后台线程先热起来，和目录扫描并行，
+    # 免得第一次 tokenize 时卡在关键路径上。
+    import threading
+    threading.Thread(target=jieba.initialize, daemon=True).start()
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+logger = logging.getLogger(__name__)
+
+# 检测用正则统一在模块级编译，绑定方法调用可以绕开 re._cache 查表。
+_RE_CHINESE = re.compile('[一-龥]')
+_RE_JP = re.compile('[぀-ヿ㄰-㆏]')
+_RE_EN_RUN = re.compile('[a-zA-Z]+')
+_RE_CJK_CHAR = re.compile('[一-龥぀-ヿ㄰-㆏]')
+
+
+def clean_filename(name):
+    """去掉文件名里的分隔符号并压缩空白，返回小写结果。"""
+    name = re.sub(r'[._\-\[\]()【】]+', ' ', name)
+    name = re.sub(r'\s+', ' ', name)
+    return name.strip().lower()
+
+
+@functools.lru_cache(maxsize=65536)
+def _segment_text_cached(text):
+    """分词实现，模块级 lru_cache：多个上下文实例共享缓存。
+
+    剧集类文件名大量重复，jieba 一次要上百微秒；
+    缓存键只有字符串本身，挂在实例上反而各自为政。
+    """
+    keywords = []
+    seen = set()    # 追加时在线去重，省掉末尾重建 dict 的那一遍
+    # 每个字符一个字节的覆盖位图，C 级索引比 set[int] 哈希快得多。
+    processed = bytearray(len(text))
+    has_cjk = _RE_CHINESE.search(text) or _RE_JP.search(text)
+    if has_cjk:
+        if JIEBA_AVAILABLE:
+            # tokenize 直接给出 (词, 起, 止)，不需要再用 text.find
+            # 回查位置，search 模式本身已包含细粒度切分，cut_all
+            # 那一遍是多余的。HMM=False 关掉未登录词的维特比解码：
+            # 文件名里的新词反正会被下面的连续段兜底补齐。
+            tokens = sorted(jieba.tokenize(text, mode='search', HMM=False),
+                            key=lambda t: t[1] - t[2])
+            for word, start, end in tokens:
+                word = word.strip()
+                # isascii+isalpha 都是 C 层 str 方法，比正则判纯英文快
+                if len(word) < 2 or (word.isascii() and word.isalpha()):
+                    continue
+                if processed.find(1, start, end) == -1:
+                    if word not in seen:
+                        seen.add(word)
+                        keywords.append(word)
+                    processed[start:end] = b'\x01' * (end - start)
+        # 连续段兜底不依赖 jieba：没装分词库时中文名也要有关键词
+        for word in _extract_longer_sequences(text, processed):
+            if word not in seen:
+                seen.add(word)
+                keywords.append(word)
+    for m in _RE_EN_RUN.finditer(text):
+        word = m.group().lower()
+        if len(word) >= 2 and word not in seen:
+            seen.add(word)
+            keywords.append(word)
+    return keywords
+
+
+def _extract_longer_sequences(text, processed):
+    """把尚未被分词覆盖的 CJK 连续片段补成关键词。"""
+    if _np is not None:
+        return _extract_longer_sequences_np(text, processed)
+    # 像词法分析器一样从左到右一遍扫出极大连续段，
+    # 代替逐 (长度, 起点) 枚举子串的 O(n^3) 写法。
+    sequences = []
+    is_cjk = _RE_CJK_CHAR.match
+    n = len(text)
+    i = 0
+    while i < n:
+        if processed[i] or not is_cjk(text[i]):
+            i += 1
+            continue
+        j = i + 1
+        while j < n and not processed[j] and is_cjk(text[j]):
+            j += 1
+        if j - i >= 2:
+            sequences.append(text[i:j])
+            processed[i:j] = b'\x01' * (j - i)
+        i = j
+    return sequences
+
+
+def _extract_longer_sequences_np(text, processed):
+    """numpy 向量化版本：一遍扫描找出所有未覆盖的 CJK 连续段。"""
+    arr = _np.frombuffer(text.encode('utf-32-le'), dtype=_np.uint32)
+    is_cjk = (((arr >= 0x4e00) & (arr <= 0x9fa5))
+              | ((arr >= 0x3040) & (arr <= 0x30ff))
+              | ((arr >= 0x3130) & (arr <= 0x318f)))
+    is_cjk &= ~_np.frombuffer(processed, dtype=_np.uint8).astype(bool)
+    # 布尔串前后补 False 后，相邻不等的位置就是每段的起止边界。
+    padded = _np.concatenate(([False], is_cjk, [False]))
+    edges = _np.flatnonzero(padded[1:] != padded[:-1])
+    sequences = []
+    for s, e in zip(edges[::2], edges[1::2]):
+        s, e = int(s), int(e)
+        if e - s >= 2:
+            sequences.append(text[s:e])
+            processed[s:e] = b'\x01' * (e - s)
+    return sequences
+
+
+class VideoOrganizerContext:
+    """整理流程中各步骤共享的配置与中间结果。"""
+
+    def __init__(self, scan_directories=None, output_directory='',
+                 video_extensions=None):
+        self.scan_directories = scan_directories or []
+        self.output_directory = output_directory
+        self.video_extensions = video_extensions or [
+            '.mp4', '.mkv', '.avi', '.rmvb', '.wmv', '.mov', '.flv', '.ts']
+        self.inverted_index = {}
+
+    def _segment_text(self, text):
+        """对清洗后的文件名分词，返回去重后的关键词列表。"""
+        return _segment_text_cached(text)
+
+    def _extract_longer_sequences(self, text, processed):
+        """把尚未被分词覆盖的 CJK 连续片段补成关键词。"""
+        return _extract_longer_sequences(text, processed)
+
+    def create_inverted_index(self, file_list):
+        """按关键词建立 文件名关键词 -> 文件信息列表 的倒排索引。"""
+        index = defaultdict(list)
+        for file_info in file_list:
+            # 清洗结果缓存在记录上，相似度分组等后续步骤直接复用。
+            cleaned = file_info.get('_cleaned')
+            if cleaned is None:
+                cleaned = clean_filename(os.path.splitext(file_info['name'])[0])
+                file_info['_cleaned'] = cleaned
+            for keyword in self._segment_text(cleaned):
+                index[keyword].append(file_info)
+        self.inverted_index = index
+        # 临时文件只是排查分词用的诊断产物，显式要求时才落盘。
+        if os.environ.get('TIDY_DUMP_INDEX'):
+            self.save_inverted_index_to_temp()
+        return index
+
+    def save_inverted_index_to_temp(self):
+        """把倒排索引落到临时文件，方便人工排查分词效果。"""
+        # json.dump 本来就是增量写出的，不必先物化一份可序列化副本
+        # （那会让峰值内存翻倍）；default=str 兜底处理非字符串的 path。
+        with tempfile.NamedTemporaryFile(
+                'w', suffix='.json', prefix='inverted_index_',
+                delete=False, encoding='utf-8') as tmp_file:
+            if _orjson is not None:
+                tmp_file.write(_orjson.dumps(
+                    dict(self.inverted_index), default=str).decode())
+            else:
+                json.dump(self.inverted_index, tmp_file, ensure_ascii=False,
+                          separators=(',', ':'), default=str)
+            logger.info('倒排索引已写入临时文件: %s', tmp_file.name)
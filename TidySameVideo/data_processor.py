@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""扫描目录、判断文件名相似并把相似文件归成组。"""
+import logging
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .context import VideoOrganizerContext, clean_filename
+from .keyword_filter import is_blacklisted_keyword
+from .linux_optimized import STATX_AVAILABLE, statx_size
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+except ImportError:
+    _rf_fuzz = None
+
+from . import minhash_index
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+logger = logging.getLogger(__name__)
+
+# 模块级共享的上下文，分词缓存挂在它身上。
+context = VideoOrganizerContext()
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.rmvb', '.wmv', '.mov',
+                    '.flv', '.ts')
+
+# 热路径上的正则统一在模块级编译。
+_KEYWORD_RE = re.compile('[\u4e00-\u9fa5]+|[a-zA-Z]+')
+_YEAR_RE = re.compile(r'(?:19|20)\d{2}')
+_NON_CJK_RE = re.compile('[^一-鿿]')
+
+
+def is_year_keyword(keyword):
+    """1900-2099 的四位年份对相似度没有区分度。"""
+    return _YEAR_RE.fullmatch(keyword) is not None
+
+
+def _iter_video_files(directory, extensions):
+    """基于 os.scandir 的递归遍历，文件大小直接取自 DirEntry。"""
+    try:
+        it = os.scandir(directory)
+    except (FileNotFoundError, PermissionError):
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_video_files(entry.path, extensions)
+            elif entry.is_file(follow_symlinks=False):
+                name = entry.name
+                stem, ext = os.path.splitext(name)
+                if ext.lower() in extensions:
+                    # 优先 statx(AT_STATX_DONT_SYNC)：只取 size 字段，
+                    # 且允许网络盘用缓存属性，不逼内核回源同步；
+                    # 不可用时 DirEntry 的 stat 也比 walk+getsize 省一半调用。
+                    if STATX_AVAILABLE:
+                        size = statx_size(entry.path)
+                    else:
+                        size = entry.stat(follow_symlinks=False).st_size
+                    # 主名在扫描时就拆好存起来，后面分组/起目录名
+                    # 不再对同一字符串反复 splitext
+                    yield {
+                        'path': entry.path,
+                        'name': name,
+                        'stem': stem,
+                        'size': size,
+                        'directory': directory,
+                    }
+
+
+def iter_video_files(directory, extensions=VIDEO_EXTENSIONS):
+    """流式递归扫描：逐条产出文件信息，不把整棵树物化成列表。
+
+    百万级文件库里做预览/统计这类单遍消费时，峰值内存只剩
+    一个滚动的工作集；需要列表的调用方继续用 scan_directory。
+    """
+    return _iter_video_files(directory, extensions)
+
+
+def scan_directory(directory, extensions=VIDEO_EXTENSIONS):
+    """递归扫描一个目录，返回视频文件信息列表。"""
+    return list(_iter_video_files(directory, extensions))
+
+
+def scan_multiple_directories(directories, extensions=VIDEO_EXTENSIONS):
+    """并行扫描多个根目录并汇总结果。
+
+    目录遍历是系统调用延迟型负载，getdents/stat 期间会释放 GIL，
+    多个根目录（尤其是跨盘/挂载点）用线程池几乎线性加速。
+    """
+    directories = list(directories)
+    all_files = []
+    if len(directories) <= 1:
+        for directory in directories:
+            all_files.extend(scan_directory(directory, extensions))
+        return all_files
+    with ThreadPoolExecutor(max_workers=min(16, len(directories))) as ex:
+        for files in ex.map(lambda d: scan_directory(d, extensions),
+                            directories):
+            all_files.extend(files)
+    return all_files
+
+
+def _cleaned_name(file_info):
+    cleaned = file_info.get('_cleaned')
+    if cleaned is None:
+        stem = file_info.get('stem')
+        if stem is None:
+            stem = os.path.splitext(file_info['name'])[0]
+        cleaned = clean_filename(stem)
+        file_info['_cleaned'] = cleaned
+    return cleaned
+
+
+def extract_name_keywords(cleaned):
+    """从清洗后的文件名里抽取中文/英文关键词。"""
+    return _KEYWORD_RE.findall(cleaned)
+
+
+@dataclass(slots=True, frozen=True)
+class FileFeatures:
+    """每个文件只算一次的相似度特征（SoA 预计算）。"""
+    clean_name: str
+    kw_set: frozenset
+    char_set_no_year: frozenset
+    chinese_char_set: frozenset
+
+
+def _chinese_codepoints(clean):
+    """清洗名里的中文字符，以码点 int 集合返回。
+
+    int 的哈希就是自身，集合交并比单字符 str 便宜；numpy 可用时
+    用 uint32 码点视图做 SIMD 区间掩码，长文件名不走逐字符 Python。
+    """
+    if _np is not None:
+        arr = _np.frombuffer(clean.encode('utf-32-le'), dtype=_np.uint32)
+        mask = (arr >= 0x4e00) & (arr <= 0x9fff)
+        return frozenset(arr[mask].tolist())
+    return frozenset(map(ord, _NON_CJK_RE.sub('', clean)))
+
+
+def _file_features(file_info):
+    """构造并缓存 file_info 的 FileFeatures。"""
+    feats = file_info.get('_features')
+    if feats is None:
+        clean = _cleaned_name(file_info)
+        stripped = _YEAR_RE.sub('', clean)
+        kw_set = frozenset(
+            k for k in context._segment_text(clean)
+            if len(k) >= 2 and not is_year_keyword(k)
+            and not is_blacklisted_keyword(k))
+        feats = FileFeatures(
+            clean_name=clean,
+            kw_set=kw_set,
+            char_set_no_year=frozenset(stripped) - {' '},
+            chinese_char_set=_chinese_codepoints(clean),
+        )
+        file_info['_features'] = feats
+    return feats
+
+
+def are_files_similar(file1, file2):
+    """多级判断两个文件名是否指向同一内容。"""
+    return _features_similar(_file_features(file1), _file_features(file2))
+
+
+def _features_similar(f1, f2):
+    """在预计算好的 FileFeatures 上做纯 set 运算的相似度判断。"""
+    clean1, clean2 = f1.clean_name, f2.clean_name
+    if clean1 == clean2:
+        return True
+    if _rf_fuzz is not None and _rf_fuzz.token_set_ratio(clean1, clean2) >= 90:
+        # rapidfuzz 的 C++/SIMD 打分替代后面多轮 Python set 运算的快路径
+        return True
+    # 注意括号：之前写成 (A and B) or C，任何子串关系都会直接判相似，
+    # 长度差的限制形同虚设。in 本身是 C 层子串查找，保留即可。
+    if (abs(len(clean1) - len(clean2)) < 5
+            and (clean1 in clean2 or clean2 in clean1)):
+        return True
+
+    # Jaccard 统一用容斥：|A∪B| = |A|+|B|-|A∩B|，
+    # 每次比较少物化一个并集 frozenset（交集是必须算的）。
+    set1, set2 = f1.char_set_no_year, f2.char_set_no_year
+    if set1 and set2:
+        inter = len(set1 & set2)
+        if inter / (len(set1) + len(set2) - inter) >= 0.8:
+            return True
+
+    # 中文字符集合重叠度
+    cs1, cs2 = f1.chinese_char_set, f2.chinese_char_set
+    if cs1 and cs2:
+        inter = len(cs1 & cs2)
+        if inter / (len(cs1) + len(cs2) - inter) >= 0.7:
+            return True
+
+    # 关键词 Jaccard 相似度
+    kws1, kws2 = f1.kw_set, f2.kw_set
+    if not kws1 or not kws2:
+        return False
+    inter = len(kws1 & kws2)
+    return inter / (len(kws1) + len(kws2) - inter) >= 0.5
+
+
+# 候选对少时进程池的启动/序列化开销不划算
+_PARALLEL_PAIR_THRESHOLD = 20000
+
+# 文件太少时建 LSH 索引不值得
+_LSH_FILE_THRESHOLD = 1000
+
+_worker_features = None
+
+
+def _init_similarity_worker(features):
+    global _worker_features
+    _worker_features = features
+
+
+def _batch_similar(pairs):
+    """子进程里批量判断候选对，返回相似的 (i, j) 列表。"""
+    feats = _worker_features
+    return [(i, j) for i, j in pairs
+            if _features_similar(feats[i], feats[j])]
+
+
+def create_inverted_index(file_list):
+    """建立 关键词 -> 文件下标列表 的倒排索引。
+
+    倒排表里只存 file_list 的下标：file_info 字典不会被重复引用，
+    候选定位也从"按 path 回查"变成 O(1) 的下标访问。
+    """
+    index = defaultdict(list)
+    for i, file_info in enumerate(file_list):
+        cleaned = _cleaned_name(file_info)
+        for keyword in set(extract_name_keywords(cleaned)):
+            if len(keyword) >= 2:
+                index[keyword].append(i)
+    return index
+
+
+def find_similar_file_groups_legacy(file_list, inverted_index=None):
+    """旧实现：用倒排索引找候选，再逐个比对（保留做结果对照）。"""
+    if inverted_index is None:
+        inverted_index = create_inverted_index(file_list)
+    groups = []
+    n = len(file_list)
+    # 旧式 关键词 -> file_info 列表 索引靠 path 回查下标，
+    # 建一次 path -> 下标 的字典，把每个候选的 O(N) 线性扫描换成 O(1)。
+    # 只在真的遇到 dict 候选时才花这份构建成本。
+    path_to_index = None
+    # 每个下标一个字节的标记位图：C 级索引取代小整数集合的哈希查找
+    processed = bytearray(n)
+    for i, file_info in enumerate(file_list):
+        if processed[i]:
+            continue
+        processed[i] = 1
+        group = [file_info]
+        is_candidate = bytearray(n)
+        candidates = []
+        for keyword in set(extract_name_keywords(_cleaned_name(file_info))):
+            for candidate in inverted_index.get(keyword, ()):
+                if not isinstance(candidate, int):
+                    if path_to_index is None:
+                        path_to_index = {
+                            f['path']: j for j, f in enumerate(file_list)}
+                    candidate = path_to_index.get(candidate['path'])
+                    if candidate is None:
+                        continue
+                if not processed[candidate] and not is_candidate[candidate]:
+                    is_candidate[candidate] = 1
+                    candidates.append(candidate)
+        for j in candidates:
+            if are_files_similar(file_info, file_list[j]):
+                group.append(file_list[j])
+                processed[j] = 1
+        if len(group) > 1:
+            groups.append(group)
+    return groups
+
+
+def find_similar_file_groups(file_list):
+    """按关键词倒排索引驱动并查集，把相似文件归成组。
+
+    只有共享至少一个有区分度关键词的文件对才会真正调用
+    are_files_similar，候选对数量比全量两两比较低几个数量级。
+    """
+    # 接受任意可迭代：分组需要随机访问，这里统一物化一次
+    if not isinstance(file_list, list):
+        file_list = list(file_list)
+    n = len(file_list)
+    if n < 2:
+        return []
+
+    features = [_file_features(file_info) for file_info in file_list]
+
+    parent = list(range(n))
+    rank = [0] * n
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]    # 路径减半
+            x = parent[x]
+        return x
+
+    def union(ra, rb):
+        # 只接受根：调用方比较相似度前本来就要 find 一次，
+        # 复用那个结果，别在这里再做两次 find。
+        if ra == rb:
+            return
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+
+    if minhash_index.LSH_AVAILABLE and n >= _LSH_FILE_THRESHOLD:
+        pairs = minhash_index.candidate_pairs(
+            [feats.kw_set for feats in features])
+    else:
+        index = create_inverted_index(file_list)
+        seen_pairs = set()
+        pairs = []
+        for keyword, posting in index.items():
+            if (len(posting) < 2 or is_year_keyword(keyword)
+                    or is_blacklisted_keyword(keyword)):
+                continue
+            rep = posting[0]
+            for j in posting[1:]:
+                pair = (rep, j) if rep < j else (j, rep)
+                if pair not in seen_pairs:
+                    seen_pairs.add(pair)
+                    pairs.append(pair)
+
+    if len(pairs) >= _PARALLEL_PAIR_THRESHOLD and (os.cpu_count() or 1) > 1:
+        # 相似度判断是纯 CPU 的 set 运算，线程帮不上忙；
+        # 候选对够多时切进程池，特征表通过 initializer 每个子进程只传一次。
+        workers = os.cpu_count()
+        chunk = (len(pairs) + workers - 1) // workers
+        chunks = [pairs[i:i + chunk] for i in range(0, len(pairs), chunk)]
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_similarity_worker,
+                                 initargs=(features,)) as ex:
+            for matched in ex.map(_batch_similar, chunks):
+                for i, j in matched:
+                    union(find(i), find(j))
+    else:
+        for i, j in pairs:
+            ri, rj = find(i), find(j)
+            if ri == rj:
+                continue
+            if _features_similar(features[i], features[j]):
+                union(ri, rj)
+
+    buckets = defaultdict(list)
+    for i in range(n):
+        buckets[find(i)].append(file_list[i])
+    return [group for group in buckets.values() if len(group) > 1]
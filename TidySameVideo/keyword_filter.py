@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""关键词黑名单：过滤掉对相似度判断没有区分度的常见词。"""
+import itertools
+
+_DEFAULT_BLACKLIST = [
+    '1080p', '720p', '2160p', '4k', 'bluray', 'web', 'dl', 'hdtv',
+    'x264', 'x265', 'h264', 'h265', 'hevc', 'aac', 'dts', 'remux',
+    'chs', 'cht', 'bd', 'uhd', 'hdr', 'mp4', 'mkv',
+    '中字', '字幕', '高清', '合集', '无水印', '完整版',
+]
+
+# frozenset 的 in 是一次哈希查找，列表版是 O(n) 的逐项比较。
+_keyword_blacklist = frozenset(_DEFAULT_BLACKLIST)
+
+
+def get_keyword_blacklist():
+    """返回当前生效的黑名单集合。"""
+    return _keyword_blacklist
+
+
+def add_blacklisted_keyword(keyword):
+    """追加一个黑名单词（重建不可变集合，查询侧无锁）。"""
+    global _keyword_blacklist
+    _keyword_blacklist = _keyword_blacklist | {keyword.lower()}
+
+
+def is_blacklisted_keyword(keyword):
+    """判断关键词是否在黑名单里（不区分大小写）。"""
+    # 中文词没有大小写，先按原串查命中，只有纯 ASCII 才值得
+    # 再付一次 lower() 的新串分配。
+    if keyword in _keyword_blacklist:
+        return True
+    if keyword.isascii():
+        return keyword.lower() in _keyword_blacklist
+    return False
+
+
+def blacklist_filter(keywords):
+    """批量过滤：返回去掉黑名单词后的关键词列表。
+
+    分词输出的英文词已经统一小写，直接把 frozenset.__contains__
+    交给 filterfalse 在 C 层逐个判断，省掉每个元素一次 Python 谓词调用。
+    """
+    return list(itertools.filterfalse(
+        _keyword_blacklist.__contains__, keywords))
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Linux 专用的 statx 绑定：扫描时取文件大小不触发文件系统同步。
+
+网络盘/懒同步的文件系统上，普通 stat 可能逼着内核先回源刷新属性；
+statx 带上 AT_STATX_DONT_SYNC 允许直接用缓存值，并且只取需要的字段。
+内核 < 4.11 或 libc 缺符号时自动禁用，调用方退回 os.stat。
+"""
+import ctypes
+import os
+import sys
+
+AT_FDCWD = -100
+AT_STATX_DONT_SYNC = 0x4000
+STATX_SIZE = 0x00000200
+
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ('tv_sec', ctypes.c_int64),
+        ('tv_nsec', ctypes.c_uint32),
+        ('__reserved', ctypes.c_int32),
+    ]
+
+
+class StructStatx(ctypes.Structure):
+    """内核 include/uapi/linux/stat.h 里 struct statx 的前半部分。"""
+    _fields_ = [
+        ('stx_mask', ctypes.c_uint32),
+        ('stx_blksize', ctypes.c_uint32),
+        ('stx_attributes', ctypes.c_uint64),
+        ('stx_nlink', ctypes.c_uint32),
+        ('stx_uid', ctypes.c_uint32),
+        ('stx_gid', ctypes.c_uint32),
+        ('stx_mode', ctypes.c_uint16),
+        ('__spare0', ctypes.c_uint16 * 1),
+        ('stx_ino', ctypes.c_uint64),
+        ('stx_size', ctypes.c_uint64),
+        ('stx_blocks', ctypes.c_uint64),
+        ('stx_attributes_mask', ctypes.c_uint64),
+        ('stx_atime', _StatxTimestamp),
+        ('stx_btime', _StatxTimestamp),
+        ('stx_ctime', _StatxTimestamp),
+        ('stx_mtime', _StatxTimestamp),
+        # 预留字段（含新内核的 stx_mnt_id 等），补满内核约定的 256 字节
+        ('__spare1', ctypes.c_uint64 * 16),
+    ]
+
+
+_statx = None
+if sys.platform == 'linux':
+    try:
+        _libc = ctypes.CDLL('libc.so.6', use_errno=True)
+        _statx = _libc.statx
+        _statx.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_int,
+                           ctypes.c_uint, ctypes.c_void_p)
+        _statx.restype = ctypes.c_int
+        # 导入时探测一次：老内核会返回 ENOSYS，之后整体禁用
+        _buf = StructStatx()
+        if _statx(AT_FDCWD, b'.', AT_STATX_DONT_SYNC, STATX_SIZE,
+                  ctypes.byref(_buf)) != 0:
+            _statx = None
+    except (OSError, AttributeError):
+        _statx = None
+
+STATX_AVAILABLE = _statx is not None
+
+
+def statx_size(path):
+    """不触发同步地取文件大小；statx 不可用或失败时退回 os.stat。"""
+    if _statx is not None:
+        buf = StructStatx()
+        if isinstance(path, str):
+            path = os.fsencode(path)
+        if (_statx(AT_FDCWD, path, AT_STATX_DONT_SYNC, STATX_SIZE,
+                   ctypes.byref(buf)) == 0
+                and buf.stx_mask & STATX_SIZE):
+            return buf.stx_size
+    return os.stat(path).st_size
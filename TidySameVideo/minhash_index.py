@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""MinHash + LSH 近重复候选索引。
+
+精确全对 Jaccard 是 O(N^2)；LSH 把候选对压到近似 O(N·k)，
+之后只对候选对跑精确相似度判断。datasketch 未安装时
+LSH_AVAILABLE 为 False，调用方退回关键词倒排展开。
+"""
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:
+    MinHash = MinHashLSH = None
+
+LSH_AVAILABLE = MinHashLSH is not None
+
+# 阈值与分组判据对齐：关键词 Jaccard >= 0.5 即判相似，
+# LSH 的召回阈值不能比它高，否则会漏候选。
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_NUM_PERM = 64
+
+
+def candidate_pairs(keyword_sets, threshold=DEFAULT_THRESHOLD,
+                    num_perm=DEFAULT_NUM_PERM):
+    """对每个关键词集合建 MinHash 签名，经 LSH 返回候选下标对。
+
+    返回排好序的 (i, j) 列表（i < j），只含签名近似重叠的对。
+    """
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    signatures = []
+    for i, keywords in enumerate(keyword_sets):
+        mh = MinHash(num_perm=num_perm)
+        for keyword in keywords:
+            mh.update(keyword.encode('utf-8'))
+        signatures.append(mh)
+        lsh.insert(i, mh)
+    pairs = set()
+    for i, mh in enumerate(signatures):
+        for j in lsh.query(mh):
+            if j != i:
+                pairs.add((i, j) if i < j else (j, i))
+    return sorted(pairs)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""并行执行文件移动任务。"""
+import atexit
+import logging
+import os
+import shutil
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import cached_fs
+
+logger = logging.getLogger(__name__)
+
+
+def calculate_optimal_workers(task_count=None):
+    """根据 CPU 数和任务量估一个线程数。
+
+    拷贝/改名几乎全程在内核里等磁盘，线程持有 GIL 的时间可以忽略，
+    所以上限放宽到 cpu*8；TIDY_MAX_WORKERS 环境变量可以整体覆盖。
+    """
+    env = os.environ.get('TIDY_MAX_WORKERS')
+    if env:
+        try:
+            return max(1, int(env))
+        except ValueError:
+            logger.warning('TIDY_MAX_WORKERS 不是整数，忽略: %r', env)
+    workers = min((os.cpu_count() or 4) * 8, 128)
+    if task_count is not None:
+        workers = min(workers, max(1, task_count))
+    return workers
+
+
+_shared_executor = None
+_executor_lock = threading.Lock()
+
+# 已确认存在的目标目录：10k 个任务落在几百个目录时，
+# makedirs(exist_ok=True) 每次至少一个 stat，缓存后只付一次。
+_ensured_dirs = set()
+_ensured_lock = threading.Lock()
+
+
+def _ensure_dir(directory):
+    """线程安全地确保目录存在，同一目录只真正 makedirs 一次。"""
+    if directory in _ensured_dirs:
+        return
+    with _ensured_lock:
+        if directory in _ensured_dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        _ensured_dirs.add(directory)
+
+
+def _get_executor():
+    """懒初始化的模块级线程池：多个批次复用，省掉反复建线程。"""
+    global _shared_executor
+    if _shared_executor is None:
+        with _executor_lock:
+            if _shared_executor is None:
+                _shared_executor = ThreadPoolExecutor(
+                    max_workers=calculate_optimal_workers(),
+                    thread_name_prefix='tidy-move')
+                atexit.register(_shared_executor.shutdown)
+    return _shared_executor
+
+
+def _copy_file(source, target):
+    """拷贝文件内容：Linux 上优先 copy_file_range（内核态拷贝）。"""
+    if hasattr(os, 'copy_file_range'):
+        size = os.stat(source).st_size
+        with open(source, 'rb') as fsrc, open(target, 'wb') as fdst:
+            try:
+                copied = 0
+                while copied < size:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(),
+                                           size - copied)
+                    if n == 0:
+                        break
+                    copied += n
+            except OSError:
+                # 个别文件系统不支持，退回用户态缓冲拷贝
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+                shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+        shutil.copystat(source, target)
+    else:
+        shutil.copy2(source, target)
+
+
+def execute_move_task(task):
+    """执行单个移动任务，返回 (是否成功, 源路径, 错误信息)。"""
+    source = task.source
+    target = task.target
+    # EAFP：exists+getsize 是两次 stat，直接 stat 一次拿全部信息
+    try:
+        src_st = os.stat(source)
+    except FileNotFoundError:
+        return False, source, '源文件不存在'
+    target_dir = os.path.dirname(target)
+    _ensure_dir(target_dir)
+    delete_source = task.delete_source
+    try:
+        tgt_st = os.stat(target)
+    except FileNotFoundError:
+        pass
+    else:
+        if tgt_st.st_size == src_st.st_size:
+            # 目标已存在且大小一致，当作已经移动过
+            if delete_source:
+                os.remove(source)
+            return True, source, None
+        return False, source, '目标已存在且大小不一致'
+    try:
+        if delete_source and src_st.st_dev == os.stat(target_dir).st_dev:
+            # 同一文件系统内的移动就是一次 rename，不用逐字节拷贝
+            os.replace(source, target)
+            return True, source, None
+        _copy_file(source, target)
+        if delete_source:
+            os.remove(source)
+    except OSError as exc:
+        return False, source, str(exc)
+    return True, source, None
+
+
+def _execute_bucket(tasks):
+    """同一目标目录的一批任务由一个 worker 顺序执行。"""
+    return [execute_move_task(task) for task in tasks]
+
+
+def parallel_execute_tasks(tasks, max_workers=None):
+    """按目标目录分桶后并行执行移动任务。
+
+    同目录的任务合成一批：makedirs 每个目录只做一次，
+    线程池的提交/调度开销也按桶摊薄。
+    """
+    if not tasks:
+        return []
+    buckets = defaultdict(list)
+    for task in tasks:
+        buckets[os.path.dirname(task.target)].append(task)
+    for target_dir in buckets:
+        _ensure_dir(target_dir)
+
+    if max_workers:
+        # 显式指定线程数时用一次性线程池，不动共享池的容量
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        executor = _get_executor()
+    results = []
+    try:
+        futures = [executor.submit(_execute_bucket, bucket)
+                   for bucket in buckets.values()]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    finally:
+        if max_workers:
+            executor.shutdown()
+    # 真实移动过文件后，规划阶段的 exists/getsize 缓存全部作废
+    cached_fs.invalidate()
+    return results
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""根据相似文件分组生成移动任务计划，并做冲突检测与校验。"""
+import itertools
+import logging
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from . import cached_fs
+from .parallel_executor import _ensure_dir, calculate_optimal_workers
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class MoveTask:
+    """一条移动任务。
+
+    10 万级任务量时，slots 实例比 5 键 dict 小好几倍、GC 压力低，
+    属性访问也比 dict[key] 少一次哈希。
+    """
+    source: str
+    target: str
+    size: int
+    group_index: int
+    file_index: int
+    delete_source: bool = True
+
+
+# Windows 的经典路径长度限制，Linux 下留同样余量也无妨
+MAX_PATH_LENGTH = 260
+
+_STATX_SIZE = 0x00000200
+_IORING_BATCH = 16384
+
+
+def check_path_length(path):
+    """路径超长时返回 False。"""
+    return len(path) <= MAX_PATH_LENGTH
+
+
+def _dir_nonempty(path):
+    """目录存在且非空时返回 True；取到第一个条目就短路。
+
+    listdir 会把整个目录物化成 Python 列表，几千条目时只为判空
+    太浪费；scandir 迭代器拿到首个条目即可收工。
+    """
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except FileNotFoundError:
+        return False
+
+
+def generate_folder_name(file_group):
+    """用组内第一个（最大的）文件的主名作为分组目录名。"""
+    first = file_group[0]
+    stem = first.get('stem')
+    if stem is None:
+        stem = os.path.splitext(first['name'])[0]
+    return stem.strip() or 'group'
+
+
+def stat_targets_batched(paths):
+    """批量 stat 一批目标路径，返回 path -> stat_result 或 None 的字典。
+
+    liburing 可用且内核支持时，把所有 statx 请求一次性塞进提交队列，
+    2N 次串行系统调用往返压成 O(N/批) 次 submit；否则退回逐个 os.stat。
+    """
+    results = {}
+    if liburing is not None and hasattr(liburing, 'io_uring_prep_statx'):
+        try:
+            return _stat_targets_io_uring(paths)
+        except OSError:
+            # 老内核（<5.18 的部分操作）或资源限制，退回串行路径
+            logger.debug('io_uring statx 不可用，退回 os.stat')
+    for path in paths:
+        try:
+            results[path] = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            results[path] = None
+    return results
+
+
+def _stat_targets_io_uring(paths):
+    """io_uring 批量 statx 的实现，按 _IORING_BATCH 分批提交。"""
+    results = {}
+    ring = liburing.io_uring()
+    liburing.io_uring_queue_init(min(_IORING_BATCH, len(paths)) or 1, ring)
+    try:
+        for start in range(0, len(paths), _IORING_BATCH):
+            batch = paths[start:start + _IORING_BATCH]
+            bufs = liburing.statx(len(batch))
+            encoded = [os.fsencode(p) for p in batch]
+            for i, raw in enumerate(encoded):
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_statx(
+                    sqe, -100, raw, 0, _STATX_SIZE, bufs[i])
+                sqe.user_data = i
+            liburing.io_uring_submit(ring)
+            cqe = liburing.io_uring_cqe()
+            for _ in batch:
+                liburing.io_uring_wait_cqe(ring, cqe)
+                i = cqe.user_data
+                results[batch[i]] = bufs[i] if cqe.res == 0 else None
+                liburing.io_uring_cqe_seen(ring, cqe)
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return results
+
+
+def _stat_size(st):
+    """统一取大小字段：os.stat_result 与 statx 缓冲字段名不同。"""
+    if st is None:
+        return None
+    # 不能用 or 串联：0 字节是合法大小，按假值短路会丢成 None
+    size = getattr(st, 'st_size', None)
+    if size is None:
+        size = getattr(st, 'stx_size', None)
+    return size
+
+
+def detect_conflicts(target_path, claimed_targets, source_size,
+                     pre_stats=None):
+    """检查一个目标路径是否与磁盘现状或已生成任务冲突。"""
+    if not check_path_length(target_path):
+        return {'target': target_path, 'type': 'path_too_long',
+                'reason': '目标路径超长'}
+    if pre_stats is not None and target_path in pre_stats:
+        st = pre_stats[target_path]
+        exists = st is not None
+        size = _stat_size(st)
+    else:
+        exists = cached_fs.exists(target_path)
+        size = cached_fs.getsize(target_path) if exists else None
+    if exists and size != source_size:
+        return {'target': target_path, 'type': 'target_exists',
+                'reason': '目标已存在且大小不一致'}
+    # 已占用目标用 set 查，一次哈希替代对任务列表的线性扫描
+    if target_path in claimed_targets:
+        return {'target': target_path, 'type': 'task_conflict',
+                'reason': '与已生成任务的目标重复'}
+    return None
+
+
+def generate_move_tasks(similar_groups, output_directory,
+                        assume_sorted=True):
+    """把相似文件分组转成移动任务列表，返回 (tasks, conflicts, total_size)。
+
+    总体积在生成时顺手累加，汇总阶段不用再对任务列表全量扫一遍。
+    分组目录以组内第一个文件命名，约定上游已按大小降序排好；
+    拿不准时传 assume_sorted=False，这里兜底排一次。
+    """
+    os.makedirs(output_directory, exist_ok=True)
+    tasks = []
+    conflicts = []
+    total_size = 0
+    claimed_targets = set()
+    # 上游分组激进时同一文件可能落进多个组，按源路径去重，
+    # 免得重复任务再去喂冲突检测
+    seen_sources = set()
+    for group_index, file_group in enumerate(similar_groups):
+        if not assume_sorted:
+            file_group = sorted(file_group, key=lambda f: -f['size'])
+        folder_name = generate_folder_name(file_group)
+        group_folder = os.path.join(output_directory, folder_name)
+        original_folder = group_folder
+        counter = 1
+        while _dir_nonempty(group_folder):
+            group_folder = f'{original_folder}_{counter}'
+            counter += 1
+
+        # 先把本组所有候选目标路径算出来，一次批量 stat，
+        # detect_conflicts 只查预取结果，不再逐个打系统调用。
+        planned = []
+        # group_folder 固定且 file_name 不会是绝对路径，
+        # 预拼好带分隔符的前缀，跳过 os.path.join 的各种分支判断
+        prefix = group_folder + os.sep
+        for file_index, file_info in enumerate(file_group):
+            if file_info['path'] in seen_sources:
+                continue
+            seen_sources.add(file_info['path'])
+            # 扫描记录里的 name 就是 basename，不必再对 path 做字符串扫描
+            planned.append((file_index, file_info,
+                            prefix + file_info['name']))
+        pre_stats = stat_targets_batched([t for _, _, t in planned])
+
+        for file_index, file_info, target_path in planned:
+            conflict = detect_conflicts(target_path, claimed_targets,
+                                        file_info['size'], pre_stats)
+            if conflict is not None:
+                conflict['source'] = file_info['path']
+                conflicts.append(conflict)
+                continue
+            tasks.append(MoveTask(
+                source=file_info['path'],
+                target=target_path,
+                size=file_info['size'],
+                group_index=group_index,
+                file_index=file_index,
+            ))
+            claimed_targets.add(target_path)
+            total_size += file_info['size']
+    return tasks, conflicts, total_size
+
+
+def _validate_dir_tasks(target_dir, dir_tasks):
+    """校验同一目标目录下的一批任务，返回 (valid, invalid)。"""
+    valid = []
+    invalid = []
+    dir_error = None
+    try:
+        # 复用执行器的已确认目录缓存：同一目录跨批次/跨线程只 makedirs 一次
+        _ensure_dir(target_dir)
+    except OSError as exc:
+        dir_error = str(exc)
+    for task in dir_tasks:
+        if dir_error is not None:
+            invalid.append({'task': task, 'reason': dir_error})
+            continue
+        # exists+isfile 是两次 stat，isfile 本身就蕴含存在性，
+        # 一次 os.stat 再看 S_ISREG 就够了
+        try:
+            st = os.stat(task.source)
+        except FileNotFoundError:
+            invalid.append({'task': task, 'reason': '源文件不存在'})
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            invalid.append({'task': task, 'reason': '源路径不是文件'})
+            continue
+        valid.append(task)
+    return valid, invalid
+
+
+def validate_move_tasks(tasks):
+    """执行前复核任务列表，返回 (valid_tasks, invalid_tasks)。
+
+    同组任务共享同一个目标目录，先按目录分组，exists/makedirs
+    每个目录只做一次；各目录的校验全是 stat 类系统调用，
+    期间释放 GIL，扔进线程池并行跑。
+    """
+    valid_tasks = []
+    invalid_tasks = []
+    grouped = [(target_dir, list(dir_tasks)) for target_dir, dir_tasks
+               in itertools.groupby(
+                   sorted(tasks, key=lambda t: os.path.dirname(t.target)),
+                   key=lambda t: os.path.dirname(t.target))]
+    if len(grouped) <= 1:
+        for target_dir, dir_tasks in grouped:
+            valid, invalid = _validate_dir_tasks(target_dir, dir_tasks)
+            valid_tasks.extend(valid)
+            invalid_tasks.extend(invalid)
+        return valid_tasks, invalid_tasks
+    workers = calculate_optimal_workers(len(grouped))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_validate_dir_tasks, target_dir, dir_tasks)
+                   for target_dir, dir_tasks in grouped]
+        for future in as_completed(futures):
+            valid, invalid = future.result()
+            valid_tasks.extend(valid)
+            invalid_tasks.extend(invalid)
+    return valid_tasks, invalid_tasks
+
+
+def generate_execution_summary(tasks, conflicts, total_size=None):
+    """汇总任务计划：数量、预计移动体积与前几条预览。
+
+    generate_move_tasks 已经边生成边累加体积，传进来就是 O(1)；
+    不传时为兼容老调用再算一遍。预览用 islice，不切片拷贝整表。
+    """
+    if total_size is None:
+        total_size = sum(task.size for task in tasks)
+    return {
+        'task_count': len(tasks),
+        'conflict_count': len(conflicts),
+        'estimated_size_mb': total_size / (1024 * 1024),
+        'task_details': [
+            {'source': task.source, 'target': task.target}
+            for task in itertools.islice(tasks, 10)
+        ],
+    }
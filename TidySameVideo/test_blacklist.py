@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""关键词黑名单的行为测试（直接 python 运行）。"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TidySameVideo.data_processor import are_files_similar
+from TidySameVideo.keyword_filter import (
+    add_blacklisted_keyword,
+    blacklist_filter,
+    is_blacklisted_keyword,
+)
+
+
+def test_basic_membership():
+    assert is_blacklisted_keyword('1080p')
+    assert is_blacklisted_keyword('X264')
+    assert is_blacklisted_keyword('中字')
+    assert not is_blacklisted_keyword('狄仁杰')
+
+
+def test_batch_filter():
+    keywords = ['avatar', 'x264', '高清', 'movie', '中字']
+    assert blacklist_filter(keywords) == ['avatar', 'movie']
+
+
+def test_add_keyword():
+    assert not is_blacklisted_keyword('测试专用词')
+    add_blacklisted_keyword('测试专用词')
+    assert is_blacklisted_keyword('测试专用词')
+    assert blacklist_filter(['测试专用词', 'ok']) == ['ok']
+
+
+def test_similarity_with_blacklist():
+    """只共享画质/压制类词汇的文件不应因此判为相似。"""
+    f1 = {'name': '神探狄仁杰 1080p 中字.mp4', 'size': 1,
+          'path': '/x/a', 'directory': '/x'}
+    f2 = {'name': '琅琊榜 1080p 中字.mp4', 'size': 1,
+          'path': '/y/b', 'directory': '/y'}
+    assert not are_files_similar(f1, f2)
+
+
+if __name__ == '__main__':
+    test_basic_membership()
+    test_batch_filter()
+    test_add_keyword()
+    test_similarity_with_blacklist()
+    print('全部黑名单测试通过')
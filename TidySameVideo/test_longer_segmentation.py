@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""长 CJK 连续段兜底与实战文件名匹配的测试（直接 python 运行）。"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TidySameVideo import context
+from TidySameVideo.data_processor import find_similar_file_groups
+
+_VERBOSE = bool(os.environ.get('TIDY_VERBOSE'))
+
+_PRACTICAL_FILES = [
+    '神探狄仁杰第一部.mp4',
+    '神探狄仁杰第一部01.mp4',
+    '琅琊榜之风起长林.mkv',
+    '琅琊榜之风起长林 高清.mkv',
+    'avatar movie 1080p.mp4',
+    'avatar.movie.remux.mp4',
+]
+
+
+def test_uncovered_sequences():
+    text = '神探狄仁杰'
+    processed = bytearray(len(text))
+    seqs = context._extract_longer_sequences(text, processed)
+    assert seqs == ['神探狄仁杰'], seqs
+    assert all(processed), processed
+
+
+def test_partially_covered():
+    text = '神探狄仁杰第一部'
+    processed = bytearray(len(text))
+    processed[0:2] = b'\x01\x01'    # "神探" 已被分词覆盖
+    seqs = context._extract_longer_sequences(text, processed)
+    assert seqs == ['狄仁杰第一部'], seqs
+
+
+def test_practical_file_matching():
+    """同一部片子的不同压制版本应归到一组。"""
+    ctx = context.VideoOrganizerContext()
+    for name in _PRACTICAL_FILES:
+        keywords = ctx._segment_text(
+            context.clean_filename(os.path.splitext(name)[0]))
+        if _VERBOSE:
+            print(f'{name} -> {keywords}')
+        assert keywords, name
+    files = [{'path': f'/库/{i}/{name}', 'name': name, 'size': 1,
+              'directory': f'/库/{i}'}
+             for i, name in enumerate(_PRACTICAL_FILES)]
+    groups = find_similar_file_groups(files)
+    assert len(groups) == 3, groups
+    # 分词缓存是模块级的，重复调用应命中同一对象
+    sample = context.clean_filename(_PRACTICAL_FILES[0])
+    assert ctx._segment_text(sample) is ctx._segment_text(sample)
+
+
+if __name__ == '__main__':
+    test_uncovered_sequences()
+    test_partially_covered()
+    test_practical_file_matching()
+    print('全部长片段分词测试通过')
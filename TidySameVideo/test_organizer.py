@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""整理流程的端到端测试（直接 python 运行）。"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TidySameVideo import parallel_executor, task_generator
+from TidySameVideo.data_processor import find_similar_file_groups, scan_directory
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+_TEST_FILES = [
+    ('a/神探狄仁杰第一部.mp4', b'x' * 64),
+    ('b/神探狄仁杰第一部01.mp4', b'y' * 32),
+    ('a/avatar movie 1080p.mp4', b'z' * 48),
+    ('b/avatar.movie.remux.mp4', b'w' * 24),
+    ('a/avatar movie extras.mp4', b'v' * 16),
+    ('b/totally unrelated doc.mp4', b'u' * 8),
+    ('a/another one 标清.mp4', b't' * 40),
+    ('b/another.one.mp4', b's' * 20),
+]
+
+
+def batched_create(paths, contents):
+    """批量创建测试文件。
+
+    liburing 可用时用 IOSQE_IO_LINK 把 openat->write->close 串成
+    链式 SQE 一次提交，8 个文件 24 次系统调用压成一次 submit；
+    否则退回普通 open/write 循环。
+    """
+    if liburing is not None and hasattr(liburing, 'io_uring_prep_openat'):
+        try:
+            _batched_create_io_uring(paths, contents)
+            return
+        except OSError:
+            pass
+    for path, content in zip(paths, contents):
+        with open(path, 'wb') as f:
+            f.write(content)
+
+
+def _batched_create_io_uring(paths, contents):
+    ring = liburing.io_uring()
+    liburing.io_uring_queue_init(len(paths) * 3, ring)
+    try:
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        for path, content in zip(paths, contents):
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_openat(
+                sqe, -100, os.fsencode(path), flags, 0o644)
+            sqe.flags |= liburing.IOSQE_IO_LINK
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_write(sqe, -1, content, len(content), 0)
+            sqe.flags |= liburing.IOSQE_IO_LINK | liburing.IOSQE_FIXED_FILE
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_close(sqe, -1)
+            sqe.flags |= liburing.IOSQE_FIXED_FILE
+        liburing.io_uring_submit(ring)
+        cqe = liburing.io_uring_cqe()
+        failed = 0
+        for _ in range(len(paths) * 3):
+            liburing.io_uring_wait_cqe(ring, cqe)
+            # 链上任何一环失败都要记下来：静默吞掉 res<0 会让
+            # 这里"成功"返回零个文件，错误要到下游断言才炸
+            if cqe.res < 0:
+                failed = -cqe.res
+            liburing.io_uring_cqe_seen(ring, cqe)
+        if failed:
+            raise OSError(failed, f'批量创建失败：{os.strerror(failed)}')
+    finally:
+        liburing.io_uring_queue_exit(ring)
+
+
+def create_test_files(base_dir):
+    """生成一套带重复的测试视频文件，返回文件信息列表。
+
+    大小等信息在创建时就已知，直接随返回值带出去，
+    测试方不需要为拿元数据再把目录 stat 一遍。
+    """
+    paths = []
+    contents = []
+    listing = []
+    for rel, payload in _TEST_FILES:
+        path = os.path.join(base_dir, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        paths.append(path)
+        contents.append(payload)
+        listing.append({
+            'path': path,
+            'name': os.path.basename(path),
+            'size': len(payload),
+            'directory': os.path.dirname(path),
+        })
+    batched_create(paths, contents)
+    return listing
+
+
+def test_full_pipeline():
+    """扫描 -> 分组 -> 生成任务 -> 校验 -> 执行 的完整链路。"""
+    with tempfile.TemporaryDirectory() as base_dir:
+        listing = create_test_files(base_dir)
+        files = scan_directory(base_dir)
+        assert len(files) == len(_TEST_FILES), len(files)
+        # 扫描结果应与创建时缓存的元数据一致
+        by_path = {f['path']: f for f in files}
+        for info in listing:
+            assert by_path[info['path']]['size'] == info['size']
+
+        groups = find_similar_file_groups(files)
+        assert groups, '应该找出至少一组相似文件'
+
+        output_dir = os.path.join(base_dir, '整理结果')
+        tasks, conflicts, total_size = task_generator.generate_move_tasks(
+            groups, output_dir)
+        assert tasks and not conflicts, (tasks, conflicts)
+
+        valid, invalid = task_generator.validate_move_tasks(tasks)
+        assert len(valid) == len(tasks) and not invalid
+
+        summary = task_generator.generate_execution_summary(
+            valid, conflicts, total_size)
+        assert summary['task_count'] == len(valid)
+
+        results = parallel_executor.parallel_execute_tasks(valid)
+        assert all(ok for ok, _, _ in results), results
+        for task in valid:
+            assert os.path.exists(task.target)
+            assert not os.path.exists(task.source)
+
+
+def test_zero_size_target():
+    """0 字节目标的大小必须是 0 而不是 None，两条冲突检测路径要一致。"""
+    with tempfile.TemporaryDirectory() as base_dir:
+        target = os.path.join(base_dir, 'empty.mp4')
+        with open(target, 'wb'):
+            pass
+        st = os.stat(target)
+        assert task_generator._stat_size(st) == 0
+        pre_stats = {target: st}
+        # 源也是 0 字节：大小一致，不该报 target_exists
+        assert task_generator.detect_conflicts(
+            target, set(), 0, pre_stats=pre_stats) is None
+        assert task_generator.detect_conflicts(target, set(), 0) is None
+        # 源大小不同：两条路径都要报冲突
+        conflict = task_generator.detect_conflicts(
+            target, set(), 100, pre_stats=pre_stats)
+        assert conflict and conflict['type'] == 'target_exists', conflict
+
+
+if __name__ == '__main__':
+    test_full_pipeline()
+    test_zero_size_target()
+    print('整理流程端到端测试通过')
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""相似度判断的回归测试（直接 python 运行）。"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from TidySameVideo.data_processor import are_files_similar
+
+
+def test_substring_respects_length_delta():
+    """短名是长名的子串但长度差太大时，不应该判为相似。"""
+    short = {'name': 'A', 'size': 1, 'path': '/x/A',
+             'directory': '/x'}
+    long = {'name': 'A_very_different_longer_movie_name.mkv', 'size': 1,
+            'path': '/y/A_very_different_longer_movie_name.mkv',
+            'directory': '/y'}
+    assert not are_files_similar(short, long)
+
+
+def test_substring_with_small_length_delta():
+    """长度相近的包含关系仍然判为相似。"""
+    f1 = {'name': '神探狄仁杰第一部.mp4', 'size': 1,
+          'path': '/x/a', 'directory': '/x'}
+    f2 = {'name': '神探狄仁杰第一部01.mp4', 'size': 1,
+          'path': '/y/b', 'directory': '/y'}
+    assert are_files_similar(f1, f2)
+
+
+def test_identical_clean_names():
+    f1 = {'name': 'avatar.movie.mp4', 'size': 1,
+          'path': '/x/a', 'directory': '/x'}
+    f2 = {'name': 'avatar_movie.mp4', 'size': 2,
+          'path': '/y/b', 'directory': '/y'}
+    assert are_files_similar(f1, f2)
+
+
+if __name__ == '__main__':
+    test_substring_respects_length_delta()
+    test_substring_with_small_length_delta()
+    test_identical_clean_names()
+    print('全部相似度测试通过')
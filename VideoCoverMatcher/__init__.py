@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""VideoCoverMatcher：为视频文件匹配并归位封面图的小工具。"""
+from .video_cover_matcher import (
+    CoverCandidate,
+    MediaFile,
+    VideoCoverMatcher,
+)
+from .utils import (
+    backup_file,
+    clean_filename,
+    load_from_json,
+    sanitize_folder_name,
+    save_to_json,
+)
+
+__all__ = [
+    'CoverCandidate', 'MediaFile', 'VideoCoverMatcher',
+    'backup_file', 'clean_filename', 'load_from_json',
+    'sanitize_folder_name', 'save_to_json',
+]
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""封面匹配工具的通用辅助函数。"""
+import json
+import os
+import re
+import shutil
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# 模块加载时编译好，热路径里不再走 re 内部那层按原串查缓存的字典
+_RE_KEEP = re.compile(r'[^一-龥a-zA-Z0-9\-_\[\]()\{\}\s.]')
+_RE_SPACES = re.compile(r'\s+')
+
+# 纯 ASCII 名的快路径转换表：白名单字符原样保留，空白归一成空格，
+# 其余删除，一次 C 层 translate 替代 Unicode 正则
+_ASCII_KEEP = frozenset(
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    '0123456789-_[](){} .')
+_ASCII_CLEAN_TABLE = str.maketrans({
+    c: (' ' if c in '\t\n\r\v\f' else None)
+    for c in map(chr, range(128)) if c not in _ASCII_KEEP})
+
+
+def clean_filename(filename):
+    """去掉文件名里的乱字符，压缩空白。"""
+    if filename.isascii():
+        # split/join 顺带完成空白压缩和首尾去空
+        return ' '.join(filename.translate(_ASCII_CLEAN_TABLE).split())
+    cleaned = _RE_KEEP.sub('', filename)
+    cleaned = _RE_SPACES.sub(' ', cleaned)
+    return cleaned.strip()
+
+
+# 非法字符换下划线、控制字符直接删，一张转换表一次 C 层扫描搞定，
+# 替代逐字符 replace（9 次全串拷贝）加一轮逐字符生成器拼接
+_FOLDER_NAME_TABLE = str.maketrans(
+    {c: '_' for c in '<>:"/\\|?*'} | {c: None for c in map(chr, range(32))})
+
+
+def sanitize_folder_name(name):
+    """把不能出现在目录名里的字符替换掉。"""
+    return name.translate(_FOLDER_NAME_TABLE).rstrip('. ') or 'unnamed_folder'
+
+
+def backup_file(file_path, backup_dir):
+    """把文件备份到指定目录，返回备份路径。"""
+    os.makedirs(backup_dir, exist_ok=True)
+    backup_path = os.path.join(backup_dir, os.path.basename(file_path))
+    shutil.copy2(file_path, backup_path)
+    return backup_path
+
+
+def save_to_json(data, file_path):
+    """把数据以 JSON 形式保存到文件。
+
+    orjson 的 C 序列化器比 stdlib 的纯 Python 缩进器快好几倍，
+    且直接产出 bytes，二进制写入少一次编码拷贝；没装时退回 json。
+    """
+    if _orjson is not None:
+        with open(file_path, 'wb') as f:
+            f.write(_orjson.dumps(data, option=_orjson.OPT_INDENT_2))
+        return
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def load_from_json(file_path):
+    """从 JSON 文件读取数据，文件不存在时返回 None。"""
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""给视频文件匹配同名/近名封面图，并把命中的封面拷到视频所在目录。
+
+封面来源按可信度分层：同目录 > 视频目录的子目录 > 父目录 > 同级目录。
+匹配时先找主名完全一致的，再退化到包含关系，最后用相似度兜底。
+"""
+import difflib
+import logging
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .utils import backup_file, clean_filename, save_to_json
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz import process as _rf_process
+except ImportError:
+    _rf_fuzz = None
+    _rf_process = None
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.wmv', '.mov', '.flv', '.ts')
+COVER_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+
+# 只认这个时间点之前创建的封面，之后的多半是本工具自己拷出来的
+COVER_CTIME_LIMIT = 1747961571
+
+# 来源层级的可信度排序，数字越小越优先
+_PRIO = {'same_dir': 0, 'sub_dir': 1, 'parent_dir': 2, 'sibling_dir': 3}
+
+
+@dataclass(slots=True)
+class MediaFile:
+    """扫描到的一个媒体文件（视频或封面图）。
+
+    slots 实例没有 __dict__，十万级文件时每个省约百字节，
+    属性访问也走固定偏移。
+    dir 在构造时算好：候选查询里到处都要按目录比较，
+    不必每次再对路径做一遍 dirname 的字符串扫描。
+    stem 是清洗并小写后的主名，匹配三轮都直接用它，
+    不用每个 (视频, 候选) 对都重做 splitext + 清洗 + lower。
+    """
+    name: str
+    path: str
+    ctime: float
+    dir: str = ''
+    stem: str = ''
+    name_lower: str = ''
+
+
+@dataclass(slots=True)
+class CoverCandidate:
+    """一个候选封面及其来源层级。"""
+    cover: MediaFile
+    source_type: str
+
+
+def _walk(path):
+    """基于 os.scandir 的递归遍历，产出文件 DirEntry。
+
+    os.walk 每层要把条目名拼回完整路径再重新 stat 区分文件/目录，
+    scandir 的 DirEntry 自带类型与 stat 缓存，大目录树下少一半系统调用。
+    读不了的子目录跳过不产出，和 os.walk 的默认行为一致。
+    """
+    try:
+        it = os.scandir(path)
+    except (FileNotFoundError, PermissionError):
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+class VideoCoverMatcher:
+    """扫描目录树，为每个视频挑一张最合适的封面。"""
+
+    def __init__(self, root_directory, similarity_threshold=0.6,
+                 backup_dir=None):
+        self.root_directory = root_directory
+        self.similarity_threshold = similarity_threshold
+        self.backup_dir = backup_dir or os.path.join(root_directory, '_backup')
+        self.videos = []
+        self.covers = []
+        self.covers_by_dir = {}
+        self._subdir_cache = {}
+        self._score_matrix = None
+        self._video_row = {}
+        self._cover_col = {}
+
+    def scan_files(self):
+        """一遍扫描根目录，把视频和封面分别收集起来。"""
+        self.videos = []
+        self.covers = []
+        self.covers_by_dir = {}
+        self._subdir_cache = {}
+        self._score_matrix = None
+        self._video_row = {}
+        self._cover_col = {}
+        for entry in _walk(self.root_directory):
+            name_lower = entry.name.lower()
+            if name_lower.endswith(VIDEO_EXTENSIONS):
+                self.videos.append(MediaFile(
+                    name=entry.name,
+                    path=entry.path,
+                    ctime=entry.stat().st_ctime,
+                    dir=os.path.dirname(entry.path),
+                    stem=clean_filename(
+                        os.path.splitext(entry.name)[0]).lower(),
+                    name_lower=name_lower,
+                ))
+            elif name_lower.endswith(COVER_EXTENSIONS):
+                # DirEntry.stat() 用的是遍历时缓存的结果；st_ctime 本身
+                # 就是 epoch 秒，直接和阈值比，不必绕道 gmtime/mktime
+                ctime = entry.stat().st_ctime
+                if ctime < COVER_CTIME_LIMIT:
+                    self.covers.append(MediaFile(
+                        name=entry.name,
+                        path=entry.path,
+                        ctime=ctime,
+                        dir=os.path.dirname(entry.path),
+                        stem=clean_filename(
+                            os.path.splitext(entry.name)[0]).lower(),
+                        name_lower=name_lower,
+                    ))
+        # 封面按所在目录建一次索引，候选查询从全表线性扫描变成哈希取值
+        for cover in self.covers:
+            self.covers_by_dir.setdefault(cover.dir, []).append(cover)
+        logger.info('扫描完成：%d 个视频，%d 张候选封面',
+                    len(self.videos), len(self.covers))
+        self._precompute_scores()
+
+    def _precompute_scores(self):
+        """rapidfuzz + numpy 齐备时，一次 cdist 算出全量相似度矩阵。
+
+        逐候选调 fuzz.ratio 每对都付一次 Python 调用开销；cdist 在
+        C 层多线程跑完整个 视频×封面 矩阵，uint8 存分数省一半内存，
+        兜底轮直接查表取行做 argmax。装不齐就留 None，走逐对路径。
+        """
+        if (_rf_process is None or _np is None
+                or not self.videos or not self.covers):
+            return
+        self._video_row = {id(v): i for i, v in enumerate(self.videos)}
+        self._cover_col = {id(c): j for j, c in enumerate(self.covers)}
+        self._score_matrix = _rf_process.cdist(
+            [v.stem for v in self.videos],
+            [c.stem for c in self.covers],
+            scorer=_rf_fuzz.ratio, workers=-1, dtype=_np.uint8)
+
+    def _list_subdirs(self, directory):
+        """列出一个目录下的子目录路径，结果按目录缓存（同目录的视频很多）。
+
+        listdir + isdir 的组合要给每个条目补一次 stat；scandir 的
+        DirEntry 自带类型缓存，is_dir() 基本不落系统调用。
+        """
+        cached = self._subdir_cache.get(directory)
+        if cached is None:
+            # 根目录是相对路径时 dirname('.') 给出 ''，scandir('') 会抛
+            # FileNotFoundError；读不了的目录同理，都按没有子目录处理
+            try:
+                with os.scandir(directory) as it:
+                    cached = [entry.path for entry in it
+                              if entry.is_dir(follow_symlinks=False)]
+            except (FileNotFoundError, PermissionError):
+                cached = []
+            self._subdir_cache[directory] = cached
+        return cached
+
+    def get_cover_candidates(self, video):
+        """按来源层级收集一个视频的候选封面。"""
+        video_dir = video.dir
+        parent_dir = os.path.dirname(video_dir)
+        candidates = []
+        # 目录层级有交叠时（比如父目录就是根）同一张封面可能被收两次，
+        # 按对象标识去重，免得后面相似度对同一封面重复打分
+        seen = set()
+
+        def _add(covers, source_type):
+            for cover in covers:
+                if id(cover) in seen:
+                    continue
+                seen.add(id(cover))
+                candidates.append(
+                    CoverCandidate(cover=cover, source_type=source_type))
+
+        _add(self.covers_by_dir.get(video_dir, ()), 'same_dir')
+        for sub_dir in self._list_subdirs(video_dir):
+            _add(self.covers_by_dir.get(sub_dir, ()), 'sub_dir')
+        _add(self.covers_by_dir.get(parent_dir, ()), 'parent_dir')
+        for sibling_dir in self._list_subdirs(parent_dir):
+            if sibling_dir != video_dir:
+                _add(self.covers_by_dir.get(sibling_dir, ()), 'sibling_dir')
+
+        return candidates
+
+    def find_best_match(self, video, candidates):
+        """在候选封面里挑最匹配的一张，没有达标的返回 None。
+
+        原来精确/包含/相似度各扫一遍候选列表；现在按来源可信度排好序
+        后单遍走完：撞上完全一致立即返回，包含关系记第一个命中，
+        相似度兜底只对前两级都没挑中的幸存者跑。
+        """
+        video_stem = video.stem
+        ordered = sorted(candidates, key=lambda c: _PRIO.get(c.source_type, 9))
+        substring_hit = None
+        survivors = []
+        for candidate in ordered:
+            cover_stem = candidate.cover.stem
+            if cover_stem == video_stem:
+                return candidate
+            if substring_hit is None and cover_stem and (
+                    cover_stem in video_stem or video_stem in cover_stem):
+                substring_hit = candidate
+            else:
+                survivors.append(candidate)
+        if substring_hit is not None:
+            return substring_hit
+        candidates = survivors
+        if not candidates:
+            return None
+
+        # 相似度兜底。rapidfuzz 的 ratio 是 C 实现的位并行算法，
+        # 比纯 Python 的 SequenceMatcher 快一两个数量级；没装时退回 difflib。
+        if self._score_matrix is not None and id(video) in self._video_row:
+            # 预计算矩阵在手：取本视频那一行里候选封面对应的列，
+            # numpy argmax 挑最高分，零次逐对打分
+            row = self._score_matrix[self._video_row[id(video)]]
+            cols = _np.fromiter(
+                (self._cover_col[id(c.cover)] for c in candidates),
+                dtype=_np.intp, count=len(candidates))
+            scores = row[cols]
+            best_idx = int(scores.argmax())
+            if scores[best_idx] >= self.similarity_threshold * 100:
+                return candidates[best_idx]
+            return None
+        if _rf_process is not None:
+            stems = {i: c.cover.stem for i, c in enumerate(candidates)}
+            hit = _rf_process.extractOne(
+                video_stem, stems, scorer=_rf_fuzz.ratio,
+                score_cutoff=self.similarity_threshold * 100)
+            if hit is None:
+                return None
+            return candidates[hit[2]]
+        best = None
+        best_ratio = self.similarity_threshold
+        lv = len(video_stem)
+        # ratio 的上界是 2*min(la,lb)/(la+lb)，先按长度差升序排，
+        # 让紧致的候选先抬高 best_ratio，后面长度悬殊的直接被上界剪掉，
+        # 省去整个 O(n*m) 的匹配计算。
+        scored = sorted(
+            ((c.cover.stem, c) for c in candidates),
+            key=lambda item: abs(len(item[0]) - lv))
+        for cover_stem, candidate in scored:
+            lc = len(cover_stem)
+            if not lc:
+                continue
+            ub = 2 * min(lv, lc) / (lv + lc)
+            if ub <= best_ratio:
+                continue
+            ratio = difflib.SequenceMatcher(
+                None, video_stem, cover_stem).ratio()
+            if ratio > best_ratio:
+                best = candidate
+                best_ratio = ratio
+        return best
+
+    def _cover_target_path(self, video, candidate):
+        """算出封面应落到的目标路径（视频目录 + 视频主名 + 封面扩展名）。"""
+        video_stem = os.path.splitext(video.name)[0]
+        cover_ext = os.path.splitext(candidate.cover.name)[1]
+        return os.path.join(video.dir, video_stem + cover_ext)
+
+    def _copy_one(self, source_path, target_path):
+        """执行一条拷贝：目标已存在就先备份再覆盖。"""
+        if os.path.exists(target_path):
+            backup_file(target_path, self.backup_dir)
+        shutil.copy2(source_path, target_path)
+        logger.info('封面 %s -> %s', source_path, target_path)
+
+    def copy_cover_to_video_dir(self, video, candidate):
+        """把封面拷到视频目录并按视频主名重命名，返回新路径。"""
+        target_path = self._cover_target_path(video, candidate)
+        if candidate.cover.path == target_path:
+            # 封面本来就躺在正确位置上，不用动
+            return target_path
+        self._copy_one(candidate.cover.path, target_path)
+        return target_path
+
+    def _process_video(self, video):
+        """单个视频的匹配：收集候选、挑最佳，无命中返回 None。
+
+        拷贝不在这里做，只把 (源, 目标) 记到结果里，由 run()
+        统一排进拷贝线程池。
+        """
+        candidates = self.get_cover_candidates(video)
+        if not candidates:
+            return None
+        best = self.find_best_match(video, candidates)
+        if best is None:
+            return None
+        return {
+            'video': video.path,
+            'cover': best.cover.path,
+            'source_type': best.source_type,
+            'target': self._cover_target_path(video, best),
+        }
+
+    def run(self, report_path=None, max_workers=8):
+        """整套流程：扫描、逐个视频匹配，最后批量拷贝封面，返回匹配报告。
+
+        各视频之间互不依赖，候选查询都是 stat 这类释放 GIL 的 I/O，
+        扔进线程池跑；max_workers=1 时退回串行。拷贝攒成队列后
+        单独并行执行——copy2 纯 I/O，几个线程就能把盘的带宽吃满。
+        """
+        self.scan_files()
+        if max_workers > 1 and len(self.videos) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                outcomes = executor.map(self._process_video, self.videos)
+                results = [r for r in outcomes if r is not None]
+        else:
+            results = [r for r in map(self._process_video, self.videos)
+                       if r is not None]
+        copy_queue = [(r['cover'], r['target']) for r in results
+                      if r['cover'] != r['target']]
+        if copy_queue:
+            if max_workers > 1 and len(copy_queue) > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    list(executor.map(
+                        lambda job: self._copy_one(*job), copy_queue))
+            else:
+                for source_path, target_path in copy_queue:
+                    self._copy_one(source_path, target_path)
+        logger.info('匹配完成：%d/%d 个视频找到封面',
+                    len(results), len(self.videos))
+        if report_path:
+            save_to_json(results, report_path)
+        return results
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s %(levelname)s %(message)s')
+    root = sys.argv[1] if len(sys.argv) > 1 else '.'
+    matcher = VideoCoverMatcher(root)
+    matcher.run(report_path=os.path.join(root, 'cover_match_report.json'))
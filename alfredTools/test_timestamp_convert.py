@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""相对时间表达式解析的测试（直接 python 运行）。"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alfredTools.timestamp_convert import _parse_delta
+
+_VERBOSE = bool(os.environ.get('TIDY_VERBOSE'))
+
+
+def test_parse_delta():
+    cases = [
+        ('now', 0),
+        ('now+1d', 86400),
+        # 文档里的例子：30m 没带符号，沿用前面的减号，m 是分钟
+        ('now-2h30m', -(2 * 3600 + 30 * 60)),
+        ('now+1d2h', 86400 + 2 * 3600),
+        # 中途换符号要生效
+        ('now-2h+30m', -2 * 3600 + 30 * 60),
+        # mo 是月（30 天），不能被拆成分钟
+        ('now-1mo', -2592000),
+        ('now+1y2mo', 31536000 + 2 * 2592000),
+        ('now+1w', 604800),
+        ('now-90s', -90),
+    ]
+    for expr, expected in cases:
+        got = _parse_delta(expr)
+        if _VERBOSE:
+            print(f'{expr} -> {got}')
+        assert got == expected, (expr, got, expected)
+
+
+if __name__ == '__main__':
+    test_parse_delta()
+    print('相对时间解析测试通过')
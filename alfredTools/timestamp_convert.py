@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Alfred workflow 脚本：时间戳与日期互转。
+
+支持的输入：
+    now / now+1d / now-2h30m   相对时间表达式
+                               （单位 s/m/h/d/w/mo/y，m 是分钟、mo 是月；
+                               不带符号的后续项沿用前一项的符号）
+    1680000000 / 1680000000000 秒/毫秒时间戳
+    2023-04-01 12:30:45.123    各种常见日期格式（分隔符 - / \\ 均可）
+"""
+import functools
+import json
+import re
+import sys
+import time
+from datetime import datetime
+
+_FAST_ISO = sys.version_info >= (3, 11)
+
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False)
+
+# 所有日期格式共享同一个前缀，用一条带命名分组的正则一次性匹配，
+# 时间戳直接由各分组拼出 struct_time，不再经过 strptime。
+_DT = re.compile(
+    r'^(?P<y>\d{4})[-/\\](?P<mo>\d{1,2})[-/\\](?P<d>\d{1,2})'
+    r'(?:[^\w](?P<H>\d{1,2})(?::(?P<M>\d{1,2})'
+    r'(?::(?P<S>\d{1,2})(?P<F>\.\d{1,9})?)?)?)?$')
+
+# mo 要放在 m 前面试配，否则 "1mo" 会被拆成分钟加一个孤立的 o
+_DELTA = re.compile(r'([+-]?)\s*(\d+)(mo|[dhswmy])')
+_UNIT = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400,
+         'w': 604800, 'mo': 2592000, 'y': 31536000}
+
+# 四条结果共用同一个空 icon，没必要每次各分配一个 {'path': ''}。
+_EMPTY_ICON = {'path': ''}
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_delta(expr):
+    """把 now±1d2h 式的表达式解析成秒数；常用表达式就那几个，缓存住。"""
+    delta = 0
+    sign = 1
+    # finditer 逐个产出 match，不像 findall 那样先攒出一整个元组列表。
+    for m in _DELTA.finditer(expr):
+        # 不带符号的项沿用前一项的符号：now-2h30m 是往回 2 小时 30 分
+        if m.group(1):
+            sign = 1 if m.group(1) == '+' else -1
+        delta += sign * int(m.group(2)) * _UNIT[m.group(3)]
+    return delta
+
+
+def getTime(ts, delta=None):
+    """把时间戳（秒）转成四种展示形式并输出给 Alfred。"""
+    ts = int(ts + (delta or 0))
+    timeArray = time.localtime(ts)
+    date_s = time.strftime('%Y-%m-%d', timeArray)
+    dt_s = time.strftime('%Y-%m-%d %H:%M:%S', timeArray)
+    sec_s = f'{ts}'
+    ms_s = f'{ts * 1000}'
+    # 固定就是四条结果，直接写成字面量，省掉类和逐条 append 的开销。
+    items = [
+        {'title': date_s, 'subtitle': '日期', 'arg': date_s, 'icon': _EMPTY_ICON},
+        {'title': dt_s, 'subtitle': '日期时间', 'arg': dt_s, 'icon': _EMPTY_ICON},
+        {'title': sec_s, 'subtitle': '时间戳（秒）', 'arg': sec_s, 'icon': _EMPTY_ICON},
+        {'title': ms_s, 'subtitle': '时间戳（毫秒）', 'arg': ms_s, 'icon': _EMPTY_ICON},
+    ]
+    sys.stdout.write(_dumps({'items': items}))
+    return items
+
+
+def process_single_input(input_str):
+    """解析单条输入，返回 Alfred items（解析失败返回空列表）。"""
+    input_str = input_str.strip()
+    if not input_str:
+        return []
+
+    # 先看首字符分流，绝大多数输入不用碰任何正则。
+    c = input_str[0]
+    if c == 'n':
+        if not input_str.startswith('now'):
+            return []
+        if input_str == 'now':
+            return getTime(time.time())
+        return getTime(time.time(), _parse_delta(input_str))
+
+    if not c.isdigit():
+        return []
+
+    if input_str.isdigit():
+        ts = int(input_str)
+        if len(input_str) >= 13:
+            ts /= 1000.0
+        return getTime(ts)
+
+    m = _DT.match(input_str)
+    if m is None:
+        return []
+    if _FAST_ISO:
+        # 3.11 起 fromisoformat 是 C 实现的快路径，还接受空格分隔的时间；
+        # 只有位数不规整（如单数字月份）的输入才会落回 mktime 分支。
+        try:
+            dt = datetime.fromisoformat(
+                input_str.replace('/', '-').replace('\\', '-'))
+            return getTime(dt.timestamp())
+        except ValueError:
+            pass
+    ts = time.mktime((int(m['y']), int(m['mo']), int(m['d']),
+                      int(m['H'] or 0), int(m['M'] or 0), int(m['S'] or 0),
+                      0, 0, -1))
+    return getTime(ts)
+
+
+def main():
+    query = sys.argv[1] if len(sys.argv) > 1 else 'now'
+    process_single_input(query)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""fileToWord：把散落的文本文件汇总成一个 Word 文档的小工具。"""
+from .file_to_word import file_to_word
+
+__all__ = ['file_to_word']
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""空行过滤行为的测试（直接 python 运行）。"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fileToWord.file_to_word import _read_and_filter
+
+_VERBOSE = bool(os.environ.get('TIDY_VERBOSE'))
+
+_SAMPLE = '第一行\n\n   \n\t\n第二行\n最后一行\n\n'
+
+
+def test_empty_lines():
+    with tempfile.TemporaryDirectory() as d:
+        test_file = os.path.join(d, 'sample.txt')
+        Path(test_file).write_text(_SAMPLE, encoding='utf-8')
+        # 读一次、splitlines 一趟，行数和过滤都基于同一份行列表
+        text = Path(test_file).read_text(encoding='utf-8')
+        lines = text.splitlines()
+        non_empty_lines = [ln for ln in lines if ln.strip()]
+        if _VERBOSE:
+            print(text)
+            print('\n'.join(non_empty_lines))
+            print('原始行数：', len(lines))
+            print('过滤后行数：', len(non_empty_lines))
+        assert len(lines) == 7, lines
+        assert non_empty_lines == ['第一行', '第二行', '最后一行']
+        # 与 file_to_word 实际使用的过滤保持一致
+        assert _read_and_filter(test_file) == '\n'.join(non_empty_lines)
+
+
+if __name__ == '__main__':
+    test_empty_lines()
+    print('空行过滤测试通过')
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""段落 XML 生成行为的测试（直接 python 运行）。"""
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fileToWord.file_to_word import _paragraphs_xml
+
+_VERBOSE = bool(os.environ.get('TIDY_VERBOSE'))
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def _texts(xml):
+    root = ET.fromstring(xml)
+    return [t.text or '' for t in root.iter(f'{_W}t')]
+
+
+def test_multiline_content():
+    """多行内容要拆成每行一个 w:p，不能把换行符塞进同一个 w:t。"""
+    content = '第一行\n第二行 <&> 符号\n第三行'
+    parts = _paragraphs_xml('样例.txt', content, need_break=False)
+    # 标题段 + 每行一段
+    assert len(parts) == 4, len(parts)
+    for xml in parts:
+        root = ET.fromstring(xml)
+        assert root.tag == f'{_W}p', root.tag
+    assert _texts(parts[0]) == ['【样例.txt】']
+    body_texts = [txt for xml in parts[1:] for txt in _texts(xml)]
+    assert body_texts == ['第一行', '第二行 <&> 符号', '第三行'], body_texts
+    # 任何文本节点里都不许残留换行符
+    assert all('\n' not in txt for txt in body_texts)
+    if _VERBOSE:
+        for xml in parts:
+            print(xml)
+
+
+def test_page_break_prepended():
+    """第二个及以后的文件前面要带一段分页符。"""
+    parts = _paragraphs_xml('a.txt', '内容', need_break=True)
+    assert len(parts) == 3, len(parts)
+    breaks = [br for br in ET.fromstring(parts[0]).iter(f'{_W}br')]
+    assert len(breaks) == 1
+    assert breaks[0].get(f'{_W}type') == 'page'
+    # 不需要分页时不生成
+    assert len(_paragraphs_xml('a.txt', '内容', need_break=False)) == 2
+
+
+if __name__ == '__main__':
+    test_multiline_content()
+    test_page_break_prepended()
+    print('段落生成测试通过')